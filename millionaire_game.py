@@ -3,9 +3,15 @@ This game supports Arabic and English interfaces for 11th-grade physics topics.
 """
 
 import argparse
+import hashlib
+import pickle
 import random
 import re
+import select
+import sys
 import time
+from array import array
+from pathlib import Path
 from typing import Dict, List, Optional
 
 QUESTION_BANK = """// The following block contains all the topics and questions for the game.
@@ -58,59 +64,150 @@ TRANSLATION_MAP: Dict[str, str] = {
 
 LANGUAGE_AR = "ar"
 LANGUAGE_EN = "en"
-
-
-def translate_text(text: str) -> str:
-    """Translate Arabic text to English using the predefined map."""
-    return TRANSLATION_MAP.get(text.strip(), text.strip())
+N_OPTIONS = 4
+
+_TOPIC_RE = re.compile(
+    r"\*\*عنوان الموضوع[^:]*:\s*((?:[^*]|\*(?!\*))+)\*\*((?:[^*]|\*(?!\*عنوان الموضوع))*)",
+    re.DOTALL,
+)
+_QUESTION_RE = re.compile(
+    r"(\d+)\.\s*السؤال:\s*(.*?)\n\s*أ\)\s*(.*?)\n\s*ب\)\s*(.*?)\n\s*ج\)\s*(.*?)\n\s*د\)\s*(.*?)(?=\n\s*\d+\.|\Z)",
+    re.DOTALL,
+)
+_CORRECT_MARKER = "الإجابة الصحيحة"
+
+# Bump whenever parse_question_bank's output changes so stale caches are ignored.
+_CACHE_VERSION = "2"
+
+
+def _parse_int(text: str) -> Optional[int]:
+    """Convert user input to an integer, returning None when it is not a number."""
+    try:
+        return int(text)
+    except ValueError:
+        return None
 
 
 def parse_question_bank(text: str) -> List[Dict[str, object]]:
-    """Parse the question bank text into a structured list of topics and questions."""
-    topics: List[Dict[str, object]] = []
-    topic_pattern = re.compile(
-        r"\*\*عنوان الموضوع.*?:\s*(.*?)\*\*(.*?)(?=\*\*عنوان الموضوع|\Z)",
-        re.DOTALL,
-    )
-    question_pattern = re.compile(
-        r"(\d+)\.\s*السؤال:\s*(.*?)\n\s*أ\)\s*(.*?)\n\s*ب\)\s*(.*?)\n\s*ج\)\s*(.*?)\n\s*د\)\s*(.*?)(?=\n\s*\d+\.|\Z)",
-        re.DOTALL,
-    )
+    """Parse the question bank text into a structured list of topics and questions.
 
-    for topic_name, content in topic_pattern.findall(text):
-        cleaned_topic = topic_name.strip()
-        questions: List[Dict[str, object]] = []
-        for (_, question_text, opt_a, opt_b, opt_c, opt_d) in question_pattern.findall(content):
-            raw_options = [opt_a, opt_b, opt_c, opt_d]
+    Each topic stores its questions as parallel lists indexed by question number:
+    ``q_text``/``q_text_en`` for the prompts, ``q_opts_ar``/``q_opts_en`` for the
+    options, and ``q_correct`` for the index of the right answer.
+    """
+    topics: List[Dict[str, object]] = []
+    # Every string below is already stripped, so the map can be queried directly.
+    lookup = TRANSLATION_MAP.get
+    for topic_match in _TOPIC_RE.finditer(text):
+        cleaned_topic = topic_match.group(1).strip()
+        q_text: List[str] = []
+        q_text_en: List[str] = []
+        q_opts_ar: List[List[str]] = []
+        q_opts_en: List[List[str]] = []
+        q_correct = array("b")
+        for question_match in _QUESTION_RE.finditer(topic_match.group(2)):
+            question_text = question_match.group(2)
+            raw_options = question_match.group(3, 4, 5, 6)
             options: List[str] = []
             correct_index = None
             for idx, option in enumerate(raw_options):
                 option_clean = option.strip()
-                if "الإجابة الصحيحة" in option_clean:
-                    option_clean = re.sub(r"\s*\(.*?الإجابة.*?\)", "", option_clean).strip()
+                marker = option_clean.find(_CORRECT_MARKER)
+                if marker != -1:
                     correct_index = idx
+                    start = option_clean.rfind("(", 0, marker)
+                    if start != -1:
+                        option_clean = option_clean[:start].rstrip()
                 options.append(option_clean)
             if correct_index is None:
                 continue
-            questions.append(
+            cleaned_question = question_text.strip()
+            q_text.append(cleaned_question)
+            q_text_en.append(lookup(cleaned_question, cleaned_question))
+            q_opts_ar.append(options)
+            q_opts_en.append([lookup(option, option) for option in options])
+            q_correct.append(correct_index)
+        if q_text:
+            topics.append(
                 {
-                    "question": question_text.strip(),
-                    "options": options,
-                    "correct_index": correct_index,
+                    "topic": cleaned_topic,
+                    "q_text": q_text,
+                    "q_text_en": q_text_en,
+                    "q_opts_ar": q_opts_ar,
+                    "q_opts_en": q_opts_en,
+                    "q_correct": q_correct,
+                    "_display_ar": cleaned_topic,
+                    "_display_en": lookup(cleaned_topic, cleaned_topic),
                 }
             )
-        if questions:
-            topics.append({"topic": cleaned_topic, "questions": questions})
     return topics
 
 
-def show_welcome_screen(delay: bool = True) -> None:
+def _load_cached_topics(text: str = QUESTION_BANK) -> List[Dict[str, object]]:
+    """Return the parsed question bank, reusing a pickled copy from a previous run when possible.
+
+    Only worth enabling for large banks: on the bundled bank hashing and unpickling
+    cost more than parsing. Used when the game is started with ``--cache-questions``.
+    """
+    # The parsed topics embed English text from TRANSLATION_MAP, so it is part of the key too.
+    key = repr((_CACHE_VERSION, text, sorted(TRANSLATION_MAP.items())))
+    digest = hashlib.blake2b(key.encode("utf-8")).hexdigest()
+    try:
+        cache_dir = Path.home() / ".cache" / "millionaire"
+    except RuntimeError:
+        # No resolvable home directory (e.g. an arbitrary container uid), so skip caching.
+        return parse_question_bank(text)
+    cache_path = cache_dir / f"{digest}.pkl"
+    try:
+        with cache_path.open("rb") as cache_file:
+            cached = pickle.load(cache_file)
+        if isinstance(cached, list):
+            return cached
+    except Exception:
+        # Any missing or unreadable cache file just means parsing from scratch.
+        pass
+
+    topics = parse_question_bank(text)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with cache_path.open("wb") as cache_file:
+            pickle.dump(topics, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+    return topics
+
+
+def build_topic_index(topics: List[Dict[str, object]]) -> Dict[str, Dict[str, object]]:
+    """Map each topic's normalized Arabic and English names to the topic itself."""
+    name_index: Dict[str, Dict[str, object]] = {}
+    for topic in topics:
+        name_index.setdefault(topic["_display_ar"].lower(), topic)
+        name_index.setdefault(topic["_display_en"].lower(), topic)
+    return name_index
+
+
+def _wait_for_enter(timeout: float) -> None:
+    """Pause for up to ``timeout`` seconds, returning early once the user presses Enter."""
+    sys.stdout.flush()
+    if not sys.stdin.isatty():
+        # Piped input holds scripted answers; reading here would swallow the first one.
+        time.sleep(timeout)
+        return
+    try:
+        ready, _, _ = select.select([sys.stdin], [], [], timeout)
+    except (OSError, ValueError):
+        # select() cannot watch console input on every platform (e.g. Windows).
+        time.sleep(timeout)
+        return
+    if ready:
+        sys.stdin.readline()
+
+
+def show_welcome_screen(delay: bool = False) -> None:
     """Display the welcome screen with the required text."""
-    print("من سيربح المليون")
-    print("EduDream School")
-    print("إعداد الأستاذ/ إسلام فارس")
+    sys.stdout.write("من سيربح المليون\nEduDream School\nإعداد الأستاذ/ إسلام فارس\n")
     if delay:
-        time.sleep(3)
+        _wait_for_enter(3)
     print()
 
 
@@ -123,56 +220,54 @@ def choose_language(preselection: Optional[str] = None) -> str:
             print("Language selected: English")
         return preselection
 
+    print("اختر اللغة / Choose a language:")
+    print("1. عربي")
+    print("2. English")
     while True:
-        print("اختر اللغة / Choose a language:")
-        print("1. عربي")
-        print("2. English")
         choice = input("> ").strip()
         if choice == "1":
             return LANGUAGE_AR
         if choice == "2":
             return LANGUAGE_EN
         print("اختيار غير صالح. حاول مرة أخرى. / Invalid selection. Try again.")
-        print()
 
 
-def resolve_topic_preselection(topics: List[Dict[str, object]], identifier: str) -> Optional[Dict[str, object]]:
+def resolve_topic_preselection(
+    topics: List[Dict[str, object]],
+    identifier: str,
+    name_index: Optional[Dict[str, Dict[str, object]]] = None,
+) -> Optional[Dict[str, object]]:
     """Match a topic using a numeric index or its Arabic/English name."""
+    identifier = identifier.strip() if identifier else ""
     if not identifier:
         return None
 
-    identifier = identifier.strip()
-    if not identifier:
-        return None
-
-    if identifier.isdigit():
-        index = int(identifier) - 1
-        if 0 <= index < len(topics):
-            return topics[index]
-        return None
+    if name_index is None:
+        name_index = build_topic_index(topics)
+    matched_topic = name_index.get(identifier.lower())
+    if matched_topic is not None:
+        return matched_topic
 
-    normalized = identifier.lower()
-    for topic in topics:
-        arabic_name = topic["topic"].strip()
-        english_name = translate_text(arabic_name).strip()
-        if normalized in {arabic_name.lower(), english_name.lower()}:
-            return topic
+    number = _parse_int(identifier)
+    if number is not None and 0 < number <= len(topics):
+        return topics[number - 1]
     return None
 
 
 def format_topic_name(topic: Dict[str, object], language: str) -> str:
     """Return the topic name in the chosen language for display."""
-    return topic["topic"] if language == LANGUAGE_AR else translate_text(topic["topic"])
+    return topic["_display_ar"] if language == LANGUAGE_AR else topic["_display_en"]
 
 
 def choose_topic(
     topics: List[Dict[str, object]],
     language: str,
     preselection: Optional[str] = None,
+    name_index: Optional[Dict[str, Dict[str, object]]] = None,
 ) -> Dict[str, object]:
     """Display topics and let the user choose one based on the selected language."""
     if preselection:
-        matched_topic = resolve_topic_preselection(topics, preselection)
+        matched_topic = resolve_topic_preselection(topics, preselection, name_index)
         if matched_topic:
             display_name = format_topic_name(matched_topic, language)
             if language == LANGUAGE_AR:
@@ -189,18 +284,17 @@ def choose_topic(
             print(fallback_message)
             print()
 
+    menu_lines = ["اختر موضوعًا:" if language == LANGUAGE_AR else "Select a topic:"]
+    menu_lines.extend(f"{idx}. {format_topic_name(topic, language)}" for idx, topic in enumerate(topics, start=1))
+    sys.stdout.write("\n".join(menu_lines) + "\n")
     while True:
-        print("اختر موضوعًا:" if language == LANGUAGE_AR else "Select a topic:")
-        for idx, topic in enumerate(topics, start=1):
-            display_name = format_topic_name(topic, language)
-            print(f"{idx}. {display_name}")
         choice = input("> ").strip()
-        if choice.isdigit():
-            index = int(choice) - 1
+        index = _parse_int(choice)
+        if index is not None:
+            index -= 1
             if 0 <= index < len(topics):
                 return topics[index]
         print("الرجاء اختيار رقم صالح." if language == LANGUAGE_AR else "Please choose a valid number.")
-        print()
 
 
 def ask_questions(
@@ -209,45 +303,57 @@ def ask_questions(
     rng: Optional[random.Random] = None,
 ) -> None:
     """Run the quiz for the selected topic with language-specific prompts."""
-    questions = topic["questions"]
-    if rng is None:
-        shuffled_questions = random.sample(questions, k=len(questions))
+    if language == LANGUAGE_EN:
+        question_texts = topic["q_text_en"]
+        option_lists = topic["q_opts_en"]
+        question_fmt = "Question {n}: {q}"
+        answer_prompt = "Enter the option number (1-4): "
+        invalid_msg = "Invalid input. Please try again."
+        correct_msg = "Correct!"
+        incorrect_fmt = "Incorrect, the right answer was {answer}."
     else:
-        shuffled_questions = rng.sample(questions, k=len(questions))
-
-    for number, question in enumerate(shuffled_questions, start=1):
-        prompt_question = question["question"]
-        options = question["options"]
-        if language == LANGUAGE_EN:
-            prompt_question = translate_text(prompt_question)
-            translated_options = [translate_text(opt) for opt in options]
-        else:
-            translated_options = options
+        question_texts = topic["q_text"]
+        option_lists = topic["q_opts_ar"]
+        question_fmt = "السؤال {n}: {q}"
+        answer_prompt = "أدخل رقم الخيار (1-4): "
+        invalid_msg = "إدخال غير صالح. حاول مرة أخرى."
+        correct_msg = "إجابة صحيحة!"
+        incorrect_fmt = "إجابة خاطئة، الإجابة الصحيحة هي: {answer}"
+    correct_indices = topic["q_correct"]
+
+    order = list(range(len(question_texts)))
+    (rng or random).shuffle(order)
+    write = sys.stdout.write
+    flush = sys.stdout.flush
+    readline = sys.stdin.readline
+
+    for number, i in enumerate(order, start=1):
+        prompt_question = question_texts[i]
+        translated_options = option_lists[i]
 
         print("-" * 50)
-        print(
-            f"السؤال {number}: {prompt_question}" if language == LANGUAGE_AR else f"Question {number}: {prompt_question}"
-        )
+        print(question_fmt.format(n=number, q=prompt_question))
         for idx, option_text in enumerate(translated_options, start=1):
             label = f"{idx}."
             print(f"{label} {option_text}")
 
         while True:
-            prompt = "أدخل رقم الخيار (1-4): " if language == LANGUAGE_AR else "Enter the option number (1-4): "
-            answer = input(prompt).strip()
-            if answer.isdigit():
-                answer_idx = int(answer) - 1
-                if 0 <= answer_idx < len(options):
+            write(answer_prompt)
+            flush()
+            line = readline()
+            if not line:
+                raise EOFError
+            answer = line.strip()
+            answer_idx = _parse_int(answer)
+            if answer_idx is not None:
+                answer_idx -= 1
+                if 0 <= answer_idx < N_OPTIONS:
                     break
-            print("إدخال غير صالح. حاول مرة أخرى." if language == LANGUAGE_AR else "Invalid input. Please try again.")
+            print(invalid_msg)
 
-        correct_idx = question["correct_index"]
+        correct_idx = correct_indices[i]
         is_correct = answer_idx == correct_idx
-        correct_text = translated_options[correct_idx]
-        if language == LANGUAGE_AR:
-            print("إجابة صحيحة!" if is_correct else f"إجابة خاطئة، الإجابة الصحيحة هي: {correct_text}")
-        else:
-            print("Correct!" if is_correct else f"Incorrect, the right answer was {correct_text}.")
+        print(correct_msg if is_correct else incorrect_fmt.format(answer=translated_options[correct_idx]))
         print()
 
     closing_message = (
@@ -280,20 +386,26 @@ def parse_cli_args() -> argparse.Namespace:
         type=int,
         help="Seed the question shuffling for a reproducible session.",
     )
+    parser.add_argument(
+        "--cache-questions",
+        action="store_true",
+        help="Reuse the parsed question bank from ~/.cache/millionaire between runs.",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     """Entry point for the quiz game."""
     args = parse_cli_args()
-    topics = parse_question_bank(QUESTION_BANK)
+    topics = _load_cached_topics() if args.cache_questions else parse_question_bank(QUESTION_BANK)
     if not topics:
         print("No questions found in the question bank.")
         return
+    name_index = build_topic_index(topics)
 
-    show_welcome_screen(delay=not args.skip_welcome)
+    show_welcome_screen(delay=not args.skip_welcome and sys.stdout.isatty())
     language = choose_language(args.language)
-    chosen_topic = choose_topic(topics, language, preselection=args.topic)
+    chosen_topic = choose_topic(topics, language, preselection=args.topic, name_index=name_index)
     rng = random.Random(args.seed) if args.seed is not None else None
     ask_questions(chosen_topic, language, rng=rng)
 